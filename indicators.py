@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import config as numba_config, njit
+    # With NUMBA_DISABLE_JIT set the kernels run as Python, so prefer the vectorized paths
+    NUMBA_AVAILABLE = not numba_config.DISABLE_JIT
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit so kernels still import without numba"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing simple moving average; the first window - 1 values are NaN"""
+    out = np.full(values.shape[0], np.nan)
+    if values.shape[0] >= window:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def rolling_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index from simple moving averages of gains and losses
+
+    Matches the pandas formulation: the first difference counts as zero
+    and the first period - 1 values are NaN. Uses the Numba kernel when
+    numba is installed, otherwise vectorized NumPy.
+    """
+    if NUMBA_AVAILABLE:
+        return _rsi_kernel(prices, period)
+
+    delta = np.diff(prices, prepend=prices[:1])
+    avg_gain = rolling_mean(np.where(delta > 0, delta, 0.0), period)
+    avg_loss = rolling_mean(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+@njit(cache=True)
+def _rsi_kernel(prices: np.ndarray, period: int) -> np.ndarray:
+    """Single O(N) pass over prices keeping running window sums"""
+    n = prices.shape[0]
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    rsi = np.full(n, np.nan)
+
+    gain_sum = 0.0
+    loss_sum = 0.0
+    gain_count = 0
+    loss_count = 0
+    for i in range(n):
+        if i > 0:
+            delta = prices[i] - prices[i - 1]
+            if delta > 0:
+                gains[i] = delta
+            elif delta < 0:
+                losses[i] = -delta
+
+        gain_sum += gains[i]
+        loss_sum += losses[i]
+        gain_count += gains[i] > 0
+        loss_count += losses[i] > 0
+        if i >= period:
+            gain_sum -= gains[i - period]
+            loss_sum -= losses[i - period]
+            gain_count -= gains[i - period] > 0
+            loss_count -= losses[i - period] > 0
+        if i < period - 1:
+            continue
+
+        # Reset empty windows so running-sum drift can't fake a tiny move
+        if gain_count == 0:
+            gain_sum = 0.0
+        if loss_count == 0:
+            loss_sum = 0.0
+        if loss_sum == 0.0:
+            if gain_sum > 0.0:
+                rsi[i] = 100.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + gain_sum / loss_sum)
+
+    return rsi
+
+
+def wilder_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    Relative Strength Index with Wilder's smoothing
+
+    The averages are seeded with the mean of the first period gains and
+    losses, then carried forward as avg = (avg * (period - 1) + x) / period.
+    The first period values are NaN. Uses the Numba kernel when numba is
+    installed, otherwise pandas' C-level ewm.
+    """
+    if NUMBA_AVAILABLE:
+        return _wilder_rsi_kernel(prices, period)
+
+    rsi = np.full(prices.shape[0], np.nan)
+    if prices.shape[0] <= period:
+        return rsi
+
+    # ewm(alpha=1/period, adjust=False) is exactly Wilder's recursion once
+    # its first value is the seed mean
+    delta = np.diff(prices)
+    averages = []
+    for moves in (np.maximum(delta, 0.0), np.maximum(-delta, 0.0)):
+        seeded = np.concatenate(([moves[:period].mean()], moves[period:]))
+        averages.append(pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy())
+    avg_gain, avg_loss = averages
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi[period:] = 100 - 100 / (1 + avg_gain / avg_loss)
+    return rsi
+
+
+@njit(cache=True)
+def _wilder_rsi_kernel(prices: np.ndarray, period: int) -> np.ndarray:
+    """Single pass carrying the smoothed gain and loss forward"""
+    n = prices.shape[0]
+    rsi = np.full(n, np.nan)
+    if n <= period:
+        return rsi
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, n):
+        delta = prices[i] - prices[i - 1]
+        gain = max(delta, 0.0)
+        loss = max(-delta, 0.0)
+        if i <= period:
+            avg_gain += gain / period
+            avg_loss += loss / period
+            if i < period:
+                continue
+        else:
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        if avg_loss == 0.0:
+            if avg_gain > 0.0:
+                rsi[i] = 100.0
+        else:
+            rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return rsi
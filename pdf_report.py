@@ -0,0 +1,96 @@
+import io
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+# Table styles are built once at import; Streamlit re-executes main.py on every rerun
+_PRICE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 14),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+_METRICS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('TEXTCOLOR', (0, 1), (-1, -1), colors.black),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 10),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+def generate_pdf_report(symbol, stock_info, price_summary, metric_groups):
+    """Generate PDF report for the stock analysis
+
+    price_summary is (current price, change, % change) and metric_groups the
+    list of (category, metrics) pairs, both computed once by the caller.
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30
+    )
+    story.append(Paragraph(f"Investment Analysis Report - {symbol}", title_style))
+    story.append(Spacer(1, 12))
+
+    # Company Info
+    story.append(Paragraph(f"Company: {stock_info.get('longName', symbol)}", styles['Heading2']))
+    story.append(Paragraph(f"Sector: {stock_info.get('sector', 'N/A')}", styles['Normal']))
+    story.append(Paragraph(f"Industry: {stock_info.get('industry', 'N/A')}", styles['Normal']))
+    story.append(Spacer(1, 12))
+
+    # Current Price Info
+    current_price, price_change, price_change_pct = price_summary
+
+    story.append(Paragraph("Current Price Information", styles['Heading2']))
+    price_data = [
+        ["Metric", "Value"],
+        ["Current Price", f"${current_price:.2f}"],
+        ["Price Change", f"${price_change:.2f}"],
+        ["Percentage Change", f"{price_change_pct:.2f}%"]
+    ]
+    price_table = Table(price_data)
+    price_table.setStyle(_PRICE_TABLE_STYLE)
+    story.append(price_table)
+    story.append(Spacer(1, 20))
+
+    # Fundamental Analysis
+    story.append(Paragraph("Fundamental Analysis", styles['Heading2']))
+    for category, category_metrics in metric_groups:
+        story.append(Paragraph(category, styles['Heading3']))
+
+        metrics_data = [
+            ["Metric", "Value"],
+            *zip(category_metrics['Metric'].to_numpy(), category_metrics['Value'].to_numpy())
+        ]
+
+        metrics_table = Table(metrics_data)
+        metrics_table.setStyle(_METRICS_TABLE_STYLE)
+        story.append(metrics_table)
+        story.append(Spacer(1, 12))
+
+    # Build PDF
+    doc.build(story)
+    buffer.seek(0)
+    return buffer
@@ -1,37 +1,56 @@
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestRegressor
 from typing import Tuple, Dict
+from indicators import rolling_mean, rolling_rsi
 
 class StockPredictor:
     def __init__(self):
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.scaler = StandardScaler()
+        # ~250 daily rows don't need 100 deep trees; build the forest on all cores
+        self.model = RandomForestRegressor(
+            n_estimators=30, max_depth=8, min_samples_leaf=3, n_jobs=-1, random_state=42
+        )
+        # Features are freshly built arrays on every call, so scale them in place
+        self.scaler = StandardScaler(copy=False)
         self.feature_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
         
     def prepare_data(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
         """
         Prepare features and target for prediction
         """
-        # Create features
-        df_features = df[self.feature_columns].copy()
-        
-        # Add technical indicators
-        df_features['SMA_5'] = df['Close'].rolling(window=5).mean()
-        df_features['SMA_20'] = df['Close'].rolling(window=20).mean()
-        df_features['RSI'] = self._calculate_rsi(df['Close'])
-        df_features['Price_Change'] = df['Close'].pct_change()
-        df_features['Volume_Change'] = df['Volume'].pct_change()
-        
+        # SMA_20 is the longest lookback; earlier rows have incomplete indicators
+        warmup = 20 - 1
+
+        # Add technical indicators, all from one float64 view of Close
+        close = df['Close'].to_numpy(dtype=np.float64)
+        volume = df['Volume'].to_numpy(dtype=np.float64)
+        features = {col: df[col].to_numpy() for col in self.feature_columns}
+        features['SMA_5'] = rolling_mean(close, 5)
+        features['SMA_20'] = rolling_mean(close, 20)
+        features['RSI'] = rolling_rsi(close, 14)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            features['Price_Change'] = np.concatenate(([np.nan], close[1:] / close[:-1] - 1))
+            features['Volume_Change'] = np.concatenate(([np.nan], volume[1:] / volume[:-1] - 1))
+
+        # Slice off the warmup once; float32 halves the bytes the scaler and
+        # forest move and matches the trees' internal dtype
+        index = df.index[warmup:]
+        df_features = pd.DataFrame(
+            {name: values[warmup:] for name, values in features.items()},
+            index=index, dtype=np.float32
+        )
+
         # Create target (next day's closing price)
-        target = df['Close'].shift(-1)
-        
-        # Drop rows with NaN values
-        df_features = df_features.dropna()
-        target = target[df_features.index]
-        
+        target = pd.Series(np.append(close[1:], np.nan)[warmup:], index=index)
+
+        # Drop rows that missing prices or zero volumes left non-finite; the
+        # last row keeps its missing target, it is the one predicted from
+        valid = np.isfinite(df_features.to_numpy()).all(axis=1)
+        valid[:-1] &= np.isfinite(target.to_numpy()[:-1])
+        if not valid.all():
+            df_features, target = df_features[valid], target[valid]
+
         return df_features, target
         
     def train(self, hist_data: pd.DataFrame) -> Dict:
@@ -45,10 +64,12 @@ class StockPredictor:
         features = features[:-1]
         target = target[:-1]
         
-        # Split data
-        X_train, X_test, y_train, y_test = train_test_split(
-            features, target, test_size=0.2, random_state=42
-        )
+        # Split chronologically: the test set is the most recent 20% of days,
+        # so no future prices leak into training
+        split = int(0.8 * len(features))
+        X, y = features.to_numpy(), target.to_numpy()
+        X_train, X_test = X[:split], X[split:]
+        y_train, y_test = y[:split], y[split:]
         
         # Scale features
         X_train_scaled = self.scaler.fit_transform(X_train)
@@ -75,7 +96,7 @@ class StockPredictor:
         features, _ = self.prepare_data(hist_data)
         
         # Get the last available data point
-        last_data = features.iloc[-1:]
+        last_data = features.to_numpy(dtype=np.float32)[-1:]
         
         # Scale the features
         last_data_scaled = self.scaler.transform(last_data)
@@ -90,15 +111,3 @@ class StockPredictor:
             'predicted_price': prediction,
             'predicted_change_percent': price_change
         }
-    
-    def _calculate_rsi(self, prices: pd.Series, periods: int = 14) -> pd.Series:
-        """Calculate Relative Strength Index"""
-        delta = prices.diff()
-        
-        gain = (delta.where(delta > 0, 0)).rolling(window=periods).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=periods).mean()
-        
-        rs = gain / loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
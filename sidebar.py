@@ -0,0 +1,29 @@
+import streamlit as st
+from datetime import date, datetime, timedelta
+from typing import Tuple
+
+def render_sidebar() -> Tuple[Tuple[str, ...], date, date]:
+    """
+    Render the sidebar inputs and return (symbols, start_date, end_date)
+    """
+    with st.sidebar:
+        st.header("SPF Stock Pulse")
+        # Stock selection
+        symbols_input = st.text_input("Enter Stock Symbol", value="AAPL").strip().upper()
+        symbols = (symbols_input,) if symbols_input else ()
+
+        # Date range selector
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=365)
+
+        date_col1, date_col2 = st.columns(2)
+        with date_col1:
+            start_date = st.date_input("Start Date", value=start_date)
+        with date_col2:
+            end_date = st.date_input("End Date", value=end_date)
+
+        # Drop cached Yahoo responses so the next fetch is fresh
+        if st.button("Refresh Data"):
+            st.cache_data.clear()
+
+    return symbols, start_date, end_date
@@ -1,14 +1,143 @@
 import pandas as pd
 import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from indicators import njit, rolling_mean, wilder_rsi
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+class TradeLog:
+    """
+    Column-wise trade log: dates and symbols as lists, direction, shares and
+    price as NumPy arrays that grow by doubling
+    """
+    BUY = 1
+    SELL = -1
+
+    def __init__(self, capacity: int = 64):
+        self.dates: List[datetime] = []
+        self.symbols: List[str] = []
+        self._types = np.empty(capacity, dtype=np.int8)
+        self._shares = np.empty(capacity)
+        self._prices = np.empty(capacity)
+        self._size = 0
+
+    @classmethod
+    def from_arrays(cls, dates: List[datetime], symbols: List[str], types: np.ndarray,
+                    shares: np.ndarray, prices: np.ndarray) -> 'TradeLog':
+        """Build a log from per-field columns without appending trade by trade"""
+        log = cls(capacity=len(types))
+        log.dates = list(dates)
+        log.symbols = list(symbols)
+        log._types[:] = types
+        log._shares[:] = shares
+        log._prices[:] = prices
+        log._size = len(types)
+        return log
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, date: datetime, symbol: str, trade_type: int, shares: float, price: float):
+        """Record one trade; trade_type is TradeLog.BUY or TradeLog.SELL"""
+        if self._size == self._types.shape[0]:
+            capacity = max(1, 2 * self._size)
+            self._types = np.resize(self._types, capacity)
+            self._shares = np.resize(self._shares, capacity)
+            self._prices = np.resize(self._prices, capacity)
+        self.dates.append(date)
+        self.symbols.append(symbol)
+        self._types[self._size] = trade_type
+        self._shares[self._size] = shares
+        self._prices[self._size] = price
+        self._size += 1
+
+    @property
+    def types(self) -> np.ndarray:
+        return self._types[:self._size]
+
+    @property
+    def shares(self) -> np.ndarray:
+        return self._shares[:self._size]
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._prices[:self._size]
+
+    def to_records(self) -> List[Dict]:
+        """Trade log as one dict per trade"""
+        values = self.shares * self.prices
+        return [
+            {'date': date, 'symbol': symbol, 'type': 'buy' if trade_type == self.BUY else 'sell',
+             'shares': shares, 'price': price, 'value': value}
+            for date, symbol, trade_type, shares, price, value in zip(
+                self.dates, self.symbols, self.types.tolist(),
+                self.shares.tolist(), self.prices.tolist(), values.tolist())
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Trade log as a DataFrame, built straight from the per-field columns"""
+        return pd.DataFrame({
+            'date': self.dates,
+            'symbol': self.symbols,
+            'type': np.where(self.types == self.BUY, 'buy', 'sell'),
+            'shares': self.shares,
+            'price': self.prices,
+            'value': self.shares * self.prices
+        })
+
+    def win_rate(self) -> float:
+        """
+        Share of sells that closed above their cost basis
+
+        Buys are matched to sells first-in, first-out per symbol. The cost of
+        the first x shares ever bought is piecewise linear in x, so each sell's
+        basis is that curve evaluated at the cumulative shares sold before and
+        after it. Buys that were never filled (non-positive or NaN shares) are skipped.
+        """
+        symbols = np.asarray(self.symbols, dtype=object)
+        types, shares, prices = self.types, self.shares, self.prices
+        profitable_trades = 0
+        total_trades = 0
+
+        for symbol in set(self.symbols):
+            in_symbol = symbols == symbol
+            buys = in_symbol & (types == self.BUY) & (shares > 0)
+            sells = in_symbol & (types == self.SELL)
+            if not sells.any():
+                continue
+
+            bought = np.concatenate(([0.0], np.cumsum(shares[buys])))
+            spent = np.concatenate(([0.0], np.cumsum(shares[buys] * prices[buys])))
+            sold = np.concatenate(([0.0], np.cumsum(shares[sells])))
+            cost_basis = np.diff(np.interp(sold, bought, spent))
+
+            total_trades += int(sells.sum())
+            profitable_trades += int(np.count_nonzero(shares[sells] * prices[sells] > cost_basis))
+
+        return profitable_trades / total_trades if total_trades > 0 else 0
+
 
 class InvestmentStrategy:
-    def __init__(self, initial_capital: float = 10000.0):
+    def __init__(self, initial_capital: float = 10000.0, precision: str = 'float32',
+                 use_polars: bool = True):
         self.initial_capital = initial_capital
+        # Build indicators with Polars' multithreaded engine when it is installed
+        self.use_polars = use_polars
+        # Indicator column dtype; float32 halves their memory traffic, pass
+        # 'float64' for full precision. Close and cash accounting stay float64.
+        self.precision = np.dtype(precision)
         self.cash = initial_capital
-        self.positions: Dict[str, float] = {}
-        self.trades_history: List[Dict] = []
+        # Single-instrument simulator: the open position is one share count
+        self._shares = 0.0
+        self._symbol: Optional[str] = None
+        self._reset_trades()
 
     def simulate(self, hist_data: pd.DataFrame, strategy_type: str = 'ma_crossover', 
                 risk_per_trade: float = 0.02) -> Dict:
@@ -20,148 +149,165 @@ class InvestmentStrategy:
         - strategy_type: Type of trading strategy ('ma_crossover', 'rsi', 'macd')
         - risk_per_trade: Maximum risk per trade as percentage of portfolio
         """
-        results = {
-            'portfolio_value': [],
-            'cash': [],
-            'trades': [],
-            'dates': []
-        }
-
         # Prepare data with technical indicators
         data = self._prepare_data(hist_data)
 
         # Initialize simulation
         self.cash = self.initial_capital
-        self.positions = {}
-        self.trades_history = []
-
-        for date, row in data.iterrows():
-            # Generate trading signals based on selected strategy
-            signal = self._generate_signal(row, strategy_type)
-
-            # Calculate position size based on risk management
-            risk_amount = self.cash * risk_per_trade
-            atr = row.get('ATR', row['Close'] * 0.02)  # Default to 2% volatility if ATR not available
-            position_size = risk_amount / atr
-
-            # Execute trades based on signals
-            if signal > 0 and self.cash > 0:  # Buy signal
-                max_shares = min(position_size, (self.cash * 0.95) / row['Close'])  # Use max 95% of cash
-                self._execute_trade(row['symbol'], max_shares, row['Close'], date, 'buy')
-            elif signal < 0 and row['symbol'] in self.positions:  # Sell signal
-                self._execute_trade(row['symbol'], self.positions[row['symbol']], 
-                                row['Close'], date, 'sell')
-
-            # Calculate portfolio value
-            portfolio_value = self._calculate_portfolio_value(data.loc[date])
-
-            # Store results
-            results['portfolio_value'].append(portfolio_value)
-            results['cash'].append(self.cash)
-            results['dates'].append(date)
+        self._shares = 0.0
+        self._symbol = None
+        self._reset_trades()
+
+        # Signals for every bar at once; the cash/position loop runs compiled
+        signals = self._generate_signals(data, strategy_type)
+        close = data['Close'].to_numpy(dtype=np.float64)
+        atr = data['ATR'].to_numpy(dtype=np.float64)
+        symbols = data['symbol'].to_numpy()
+
+        (portfolio_values, cash_history, trade_idx, trade_shares,
+         trade_prices, trade_types, position, holding) = _run_backtest(
+            close, atr, signals, self.initial_capital, risk_per_trade)
+
+        # Rebuild the trade log and final state outside the hot loop
+        self._trades = TradeLog.from_arrays(
+            data.index[trade_idx].tolist(), symbols[trade_idx].tolist(),
+            trade_types, trade_shares, trade_prices)
+        if len(cash_history):
+            self.cash = float(cash_history[-1])
+        if holding:
+            self._shares = float(position)
+            self._symbol = symbols[-1]
+
+        # Per-bar history stays in the kernel's preallocated arrays
+        results = {
+            'portfolio_value': portfolio_values,
+            'cash': cash_history,
+            'dates': data.index
+        }
 
         return self._calculate_metrics(results)
 
+    def simulate_grid(self, jobs: List[Tuple[pd.DataFrame, str]], n_workers: Optional[int] = None,
+                      risk_per_trade: float = 0.02) -> pd.DataFrame:
+        """
+        Run independent simulations in parallel worker processes
+
+        Parameters:
+        - jobs: (hist_data, strategy_type) pairs, e.g. every symbol crossed with every strategy
+        - n_workers: Number of processes; defaults to the CPU count
+        - risk_per_trade: Maximum risk per trade as percentage of portfolio
+
+        Returns one row of summary metrics per job, in job order.
+        """
+        if not jobs:
+            return pd.DataFrame()
+
+        n_workers = n_workers or os.cpu_count() or 1
+        chunksize = max(1, len(jobs) // (4 * n_workers))
+        settings = {'initial_capital': self.initial_capital, 'precision': self.precision.name,
+                    'use_polars': self.use_polars}
+        args = [(hist_data, strategy_type, settings, risk_per_trade) for hist_data, strategy_type in jobs]
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            rows = list(pool.map(_run_one, args, chunksize=chunksize))
+        return pd.DataFrame(rows)
+
     def _prepare_data(self, hist_data: pd.DataFrame) -> pd.DataFrame:
-        """Add technical indicators to historical data"""
-        data = hist_data.copy()
-
-        # Moving averages
-        data['SMA_20'] = data['Close'].rolling(window=20).mean()
-        data['SMA_50'] = data['Close'].rolling(window=50).mean()
-        data['EMA_12'] = data['Close'].ewm(span=12).mean()
-        data['EMA_26'] = data['Close'].ewm(span=26).mean()
-
-        # MACD
-        data['MACD'] = data['EMA_12'] - data['EMA_26']
-        data['Signal_Line'] = data['MACD'].ewm(span=9).mean()
-
-        # RSI
-        delta = data['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-        rs = gain / loss
-        data['RSI'] = 100 - (100 / (1 + rs))
-
-        # Average True Range (ATR)
-        high_low = data['High'] - data['Low']
-        high_close = abs(data['High'] - data['Close'].shift())
-        low_close = abs(data['Low'] - data['Close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = ranges.max(axis=1)
-        data['ATR'] = true_range.rolling(window=14).mean()
+        """
+        Add technical indicators to historical data
+
+        Only the indicator columns are allocated; the OHLCV columns may share
+        memory with hist_data, so the returned frame must not be mutated.
+        """
+        close_series = hist_data['Close'].astype(np.float64)
+        close = close_series.to_numpy()
+        high = hist_data['High'].to_numpy(dtype=np.float64)
+        low = hist_data['Low'].to_numpy(dtype=np.float64)
+
+        if self.use_polars and POLARS_AVAILABLE:
+            sma_20, sma_50, ema_12, ema_26, macd, signal_line, atr = _polars_indicators(close, high, low)
+        else:
+            # Moving averages
+            sma_20 = rolling_mean(close, 20)
+            sma_50 = rolling_mean(close, 50)
+            ema_12 = close_series.ewm(span=12).mean().to_numpy()
+            ema_26 = close_series.ewm(span=26).mean().to_numpy()
+
+            # MACD
+            macd = ema_12 - ema_26
+            signal_line = pd.Series(macd).ewm(span=9).mean().to_numpy()
+
+            # Average True Range (ATR); fmax skips the missing previous close on the first bar
+            close_prev = np.concatenate(([np.nan], close[:-1]))
+            true_range = np.fmax(high - low, np.fmax(np.abs(high - close_prev), np.abs(low - close_prev)))
+            atr = rolling_mean(true_range, 14)
+            # Default to 2% volatility until 14 bars of true range are available
+            atr = np.where(np.isnan(atr), close * 0.02, atr)
+
+        # RSI with Wilder's smoothing; its SMA-seeded recursion stays in the compiled kernel
+        rsi = wilder_rsi(close, 14)
+
+        # A shallow copy shares the OHLCV blocks; assign() would deep-copy them
+        # before pandas' copy-on-write mode
+        data = hist_data.copy(deep=False)
+        indicators = {
+            'SMA_20': sma_20, 'SMA_50': sma_50, 'EMA_12': ema_12, 'EMA_26': ema_26,
+            'MACD': macd, 'Signal_Line': signal_line, 'RSI': rsi, 'ATR': atr
+        }
+        for name, values in indicators.items():
+            data[name] = values.astype(self.precision, copy=False)
 
         return data
 
-    def _generate_signal(self, data: pd.Series, strategy_type: str) -> float:
+    def _generate_signals(self, data: pd.DataFrame, strategy_type: str) -> np.ndarray:
         """
-        Generate trading signal based on selected strategy
-        Returns: float between -1 (strong sell) and 1 (strong buy)
+        Generate trading signals for every bar based on selected strategy
+        Returns: array of floats between -1 (strong sell) and 1 (strong buy)
         """
-        signal = 0.0
-
         if strategy_type == 'ma_crossover':
-            # Moving average crossover strategy
-            if data['SMA_20'] > data['SMA_50']:
-                signal += 0.5
-            else:
-                signal -= 0.5
-
-            # Add trend strength
-            trend_strength = abs(data['SMA_20'] - data['SMA_50']) / data['SMA_50']
-            signal *= (1 + trend_strength)
+            # Moving average crossover strategy, scaled by trend strength
+            sma_20 = data['SMA_20'].to_numpy(dtype=np.float64)
+            sma_50 = data['SMA_50'].to_numpy(dtype=np.float64)
+            signal = np.where(sma_20 > sma_50, 0.5, -0.5)
+            signal *= 1 + np.abs(sma_20 - sma_50) / sma_50
 
         elif strategy_type == 'rsi':
-            # RSI strategy
-            if data['RSI'] < 30:  # Oversold
-                signal += 1
-            elif data['RSI'] > 70:  # Overbought
-                signal -= 1
+            # RSI strategy: buy oversold, sell overbought
+            rsi = data['RSI'].to_numpy(dtype=np.float64)
+            signal = np.where(rsi < 30, 1.0, np.where(rsi > 70, -1.0, 0.0))
 
         elif strategy_type == 'macd':
-            # MACD strategy
-            if data['MACD'] > data['Signal_Line']:
-                signal += 0.5
-            else:
-                signal -= 0.5
+            # MACD strategy, scaled by momentum strength
+            macd = data['MACD'].to_numpy(dtype=np.float64)
+            signal_line = data['Signal_Line'].to_numpy(dtype=np.float64)
+            signal = np.where(macd > signal_line, 0.5, -0.5)
+            signal *= 1 + np.abs(macd - signal_line)
 
-            # Add momentum strength
-            momentum = abs(data['MACD'] - data['Signal_Line'])
-            signal *= (1 + momentum)
+        else:
+            signal = np.zeros(len(data))
 
         return np.clip(signal, -1, 1)
 
-    def _execute_trade(self, symbol: str, shares: float, price: float, 
-                     date: datetime, trade_type: str):
-        """Execute trade and record it"""
-        if trade_type == 'buy':
-            cost = shares * price
-            if cost <= self.cash:
-                self.cash -= cost
-                self.positions[symbol] = self.positions.get(symbol, 0) + shares
-        else:  # sell
-            proceeds = shares * price
-            self.cash += proceeds
-            del self.positions[symbol]
-
-        self.trades_history.append({
-            'date': date,
-            'symbol': symbol,
-            'type': trade_type,
-            'shares': shares,
-            'price': price,
-            'value': shares * price
-        })
+    def _reset_trades(self):
+        """Start an empty trade log"""
+        self._trades = TradeLog()
 
-    def _calculate_portfolio_value(self, current_prices) -> float:
-        """Calculate total portfolio value"""
-        positions_value = sum(shares * current_prices['Close']
-                           for symbol, shares in self.positions.items())
-        return self.cash + positions_value
+    @property
+    def positions(self) -> Dict[str, float]:
+        """Open position as a symbol -> shares mapping"""
+        return {self._symbol: self._shares} if self._symbol is not None else {}
+
+    @property
+    def trades_history(self) -> List[Dict]:
+        """Trade log as one dict per trade"""
+        return self._trades.to_records()
+
+    def trades_frame(self) -> pd.DataFrame:
+        """Trade log as a DataFrame"""
+        return self._trades.to_frame()
 
     def _calculate_metrics(self, results: Dict) -> Dict:
         """Calculate comprehensive performance metrics"""
-        portfolio_values = np.array(results['portfolio_value'])
+        portfolio_values = np.asarray(results['portfolio_value'])
         daily_returns = np.diff(portfolio_values) / portfolio_values[:-1]
 
         # Calculate metrics
@@ -170,10 +316,8 @@ class InvestmentStrategy:
         max_drawdown = np.min(portfolio_values / np.maximum.accumulate(portfolio_values)) - 1
 
         # Calculate win rate
-        profitable_trades = sum(1 for trade in self.trades_history if trade['type'] == 'sell' 
-                              and trade['value'] > trade['shares'] * self._find_buy_price(trade))
-        total_trades = sum(1 for trade in self.trades_history if trade['type'] == 'sell')
-        win_rate = profitable_trades / total_trades if total_trades > 0 else 0
+        trades = self.trades_history
+        win_rate = self._trades.win_rate()
 
         return {
             'initial_capital': self.initial_capital,
@@ -183,20 +327,154 @@ class InvestmentStrategy:
             'sharpe_ratio': sharpe_ratio,
             'max_drawdown_pct': f"{max_drawdown * 100:.2f}%",
             'win_rate': f"{win_rate * 100:.2f}%",
-            'trades_count': len(self.trades_history),
+            'trades_count': len(trades),
             'portfolio_history': {
                 'dates': results['dates'],
                 'values': results['portfolio_value'],
                 'cash': results['cash']
             },
-            'trades': self.trades_history
+            'trades': trades
         }
 
-    def _find_buy_price(self, sell_trade: Dict) -> float:
-        """Find the corresponding buy price for a sell trade"""
-        for trade in self.trades_history:
-            if (trade['type'] == 'buy' and 
-                trade['symbol'] == sell_trade['symbol'] and 
-                trade['date'] < sell_trade['date']):
-                return trade['price']
-        return 0.0
\ No newline at end of file
+
+def _polars_indicators(close: np.ndarray, high: np.ndarray, low: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    SMA_20, SMA_50, EMA_12, EMA_26, MACD, Signal_Line and ATR as one lazy Polars query
+
+    Mirrors the NumPy path: adjusted EWMs that carry their last value over
+    missing prices, NaN rolling warmups, true range that skips missing inputs,
+    and ATR defaulting to 2% of Close.
+    """
+    close_col = pl.col('Close')
+    close_prev = close_col.shift(1)
+    # Polars emits null on null rows where pandas repeats the last average
+    ema_12 = close_col.ewm_mean(span=12).forward_fill()
+    ema_26 = close_col.ewm_mean(span=26).forward_fill()
+    macd = ema_12 - ema_26
+    true_range = pl.max_horizontal(
+        pl.col('High') - pl.col('Low'),
+        (pl.col('High') - close_prev).abs(),
+        (pl.col('Low') - close_prev).abs()
+    )
+    # Polars treats NaN as a value, so turn missing prices into nulls that
+    # ewm_mean and max_horizontal skip like pandas and np.fmax do
+    prices = pl.LazyFrame({'Close': close, 'High': high, 'Low': low}).with_columns(pl.all().fill_nan(None))
+    frame = prices.with_columns(
+        close_col.rolling_mean(20).alias('SMA_20'),
+        close_col.rolling_mean(50).alias('SMA_50'),
+        ema_12.alias('EMA_12'),
+        ema_26.alias('EMA_26'),
+        macd.alias('MACD'),
+        macd.ewm_mean(span=9).forward_fill().alias('Signal_Line'),
+        true_range.rolling_mean(14).fill_null(close_col * 0.02).alias('ATR')
+    ).collect()
+
+    names = ('SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'MACD', 'Signal_Line', 'ATR')
+    # Float columns come back with nulls as NaN
+    return tuple(frame[name].to_numpy() for name in names)
+
+
+def _run_one(job: Tuple[pd.DataFrame, str, Dict, float]) -> Dict:
+    """Simulate one job on a fresh strategy, so workers share no cash or position state"""
+    hist_data, strategy_type, settings, risk_per_trade = job
+    metrics = InvestmentStrategy(**settings).simulate(hist_data, strategy_type, risk_per_trade)
+    return {
+        'symbol': hist_data['symbol'].iloc[0],
+        'strategy': strategy_type,
+        'final_value': metrics['final_value'],
+        'total_return': metrics['total_return'],
+        'sharpe_ratio': metrics['sharpe_ratio'],
+        'max_drawdown_pct': metrics['max_drawdown_pct'],
+        'win_rate': metrics['win_rate'],
+        'trades_count': metrics['trades_count']
+    }
+
+
+def _run_backtest(close: np.ndarray, atr: np.ndarray, signals: np.ndarray,
+                  initial_capital: float, risk_per_trade: float):
+    """
+    Backtest a single instrument: run the signal bars through _run_events,
+    then forward-fill its post-trade state onto every bar with NumPy
+
+    Returns portfolio value and cash per bar, the bar index, shares, price
+    and direction (1 buy, -1 sell) of every trade, and the final position.
+    """
+    # Only bars with a nonzero signal can trade; state is carried across the rest
+    event_bars = np.flatnonzero((signals > 0) | (signals < 0))
+    (cash_after, position_after, holding_after, trade_idx, trade_shares,
+     trade_prices, trade_types) = _run_events(
+        close, atr, signals, event_bars, initial_capital, risk_per_trade)
+
+    # Forward-fill the post-event state onto every bar
+    last_event = np.searchsorted(event_bars, np.arange(close.shape[0]), side='right') - 1
+    started = last_event >= 0
+    cash_history = np.full(close.shape[0], float(initial_capital))
+    position = np.zeros(close.shape[0])
+    holding = np.zeros(close.shape[0], dtype=bool)
+    cash_history[started] = cash_after[last_event[started]]
+    position[started] = position_after[last_event[started]]
+    holding[started] = holding_after[last_event[started]]
+    portfolio_values = np.where(holding, cash_history + position * close, cash_history)
+
+    final_position = position_after[-1] if len(event_bars) else 0.0
+    final_holding = bool(holding_after[-1]) if len(event_bars) else False
+    return (portfolio_values, cash_history, trade_idx, trade_shares,
+            trade_prices, trade_types, final_position, final_holding)
+
+
+@njit(cache=True)
+def _run_events(close: np.ndarray, atr: np.ndarray, signals: np.ndarray, event_bars: np.ndarray,
+                initial_capital: float, risk_per_trade: float):
+    """Apply the trades on signal bars, recording cash and position after each one"""
+    n_events = event_bars.shape[0]
+    cash_after = np.empty(n_events)
+    position_after = np.empty(n_events)
+    holding_after = np.empty(n_events, dtype=np.bool_)
+    trade_idx = np.empty(n_events, dtype=np.int64)
+    trade_shares = np.empty(n_events)
+    trade_prices = np.empty(n_events)
+    trade_types = np.empty(n_events, dtype=np.int8)
+
+    cash = initial_capital
+    position = 0.0
+    holding = False
+    n_trades = 0
+    for k in range(n_events):
+        i = event_bars[k]
+        price = close[i]
+
+        # Calculate position size based on risk management
+        position_size = cash * risk_per_trade / atr[i]
+
+        direction = 0
+        if signals[i] > 0 and cash > 0:  # Buy signal, using max 95% of cash
+            shares = position_size
+            cash_limit = (cash * 0.95) / price
+            if cash_limit < shares:
+                shares = cash_limit
+            cost = shares * price
+            if cost <= cash:
+                cash -= cost
+                position += shares
+                holding = True
+            direction = 1
+        elif signals[i] < 0 and holding:  # Sell signal, closing the position
+            shares = position
+            cash += shares * price
+            position = 0.0
+            holding = False
+            direction = -1
+
+        if direction != 0:
+            trade_idx[n_trades] = i
+            trade_shares[n_trades] = shares
+            trade_prices[n_trades] = price
+            trade_types[n_trades] = direction
+            n_trades += 1
+
+        cash_after[k] = cash
+        position_after[k] = position
+        holding_after[k] = holding
+
+    return (cash_after, position_after, holding_after, trade_idx[:n_trades],
+            trade_shares[:n_trades], trade_prices[:n_trades], trade_types[:n_trades])
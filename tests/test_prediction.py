@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from prediction import StockPredictor
+
+
+def make_hist_data(n=250, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.5, n),
+        'High': close + 2,
+        'Low': close - 2,
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, n)
+    }, index=pd.bdate_range('2024-01-01', periods=n, tz='America/New_York'))
+
+
+class StockPredictorTest(unittest.TestCase):
+    def test_train_and_predict(self):
+        hist_data = make_hist_data()
+        predictor = StockPredictor()
+        metrics = predictor.train(hist_data)
+        prediction = predictor.predict_next_day(hist_data)
+
+        self.assertEqual(len(metrics['feature_importance']), 10)
+        self.assertTrue(np.isfinite(prediction['predicted_price']))
+
+    def test_missing_close_mid_series(self):
+        hist_data = make_hist_data()
+        hist_data.iloc[120, hist_data.columns.get_loc('Close')] = np.nan
+
+        predictor = StockPredictor()
+        features, target = predictor.prepare_data(hist_data)
+        self.assertTrue(np.isfinite(features.to_numpy()).all())
+        self.assertTrue(np.isfinite(target.to_numpy()[:-1]).all())
+        self.assertEqual(features.index[-1], hist_data.index[-1])
+
+        predictor.train(hist_data)
+        prediction = predictor.predict_next_day(hist_data)
+        self.assertTrue(np.isfinite(prediction['predicted_price']))
+
+
+if __name__ == '__main__':
+    unittest.main()
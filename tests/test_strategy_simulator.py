@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from strategy_simulator import InvestmentStrategy, POLARS_AVAILABLE
+
+INDICATORS = ['SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'MACD', 'Signal_Line', 'RSI', 'ATR']
+
+
+def make_hist_data(n=400, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+    return pd.DataFrame({
+        'Open': close,
+        'High': close * (1 + rng.uniform(0, 0.02, n)),
+        'Low': close * (1 - rng.uniform(0, 0.02, n)),
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, n),
+        'symbol': 'TEST'
+    }, index=pd.bdate_range('2020-01-01', periods=n, tz='America/New_York'))
+
+
+@unittest.skipUnless(POLARS_AVAILABLE, "polars is not installed")
+class PolarsParityTest(unittest.TestCase):
+    def assert_paths_match(self, hist_data):
+        polars_data = InvestmentStrategy(precision='float64', use_polars=True)._prepare_data(hist_data)
+        numpy_data = InvestmentStrategy(precision='float64', use_polars=False)._prepare_data(hist_data)
+        for name in INDICATORS:
+            np.testing.assert_allclose(
+                polars_data[name].to_numpy(), numpy_data[name].to_numpy(),
+                rtol=1e-10, atol=1e-10, err_msg=name
+            )
+
+    def test_clean_prices(self):
+        self.assert_paths_match(make_hist_data())
+
+    def test_missing_prices(self):
+        hist_data = make_hist_data()
+        hist_data.iloc[[0, 100, 101, 250], hist_data.columns.get_loc('Close')] = np.nan
+        hist_data.iloc[[180], hist_data.columns.get_loc('High')] = np.nan
+        self.assert_paths_match(hist_data)
+
+        # A gap must not poison every later EWM value
+        prepared = InvestmentStrategy(use_polars=True)._prepare_data(hist_data)
+        self.assertFalse(prepared['MACD'].iloc[1:].isna().any())
+
+    def test_backtest_matches(self):
+        hist_data = make_hist_data()
+        hist_data.iloc[[100, 250], hist_data.columns.get_loc('Close')] = np.nan
+        for strategy_type in ['ma_crossover', 'rsi', 'macd']:
+            with_polars = InvestmentStrategy(use_polars=True).simulate(hist_data, strategy_type)
+            without_polars = InvestmentStrategy(use_polars=False).simulate(hist_data, strategy_type)
+            self.assertEqual(with_polars['trades_count'], without_polars['trades_count'])
+            self.assertAlmostEqual(with_polars['final_value'], without_polars['final_value'], places=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from datetime import date
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import utils
+
+
+class FakeTicker:
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, start=None, end=None):
+        if self.symbol == 'EMPTY':
+            return pd.DataFrame(columns=['Open', 'High', 'Low', 'Close', 'Volume'])
+        index = pd.bdate_range(start, end, tz='America/New_York')
+        close = np.linspace(100, 110, len(index))
+        return pd.DataFrame({'Open': close, 'High': close + 1, 'Low': close - 1,
+                             'Close': close, 'Volume': 1_000_000}, index=index)
+
+    def get_info(self):
+        return {'longName': self.symbol}
+
+
+@mock.patch.object(utils.yf, 'Ticker', FakeTicker)
+class GetStockDataBatchTest(unittest.TestCase):
+    def setUp(self):
+        utils._fetch_stock_data.clear()
+
+    def test_fetches_each_symbol(self):
+        data = utils.get_stock_data_batch(('AAA', 'BBB'), date(2024, 1, 1), date(2024, 3, 1))
+        self.assertEqual(list(data), ['AAA', 'BBB'])
+        for symbol, (hist_data, stock_info) in data.items():
+            self.assertFalse(hist_data.empty)
+            self.assertEqual(stock_info['longName'], symbol)
+
+    def test_empty_history_maps_to_none(self):
+        data = utils.get_stock_data_batch(('EMPTY',), date(2024, 1, 1), date(2024, 3, 1))
+        self.assertEqual(data, {'EMPTY': (None, None)})
+
+
+if __name__ == '__main__':
+    unittest.main()
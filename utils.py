@@ -1,6 +1,8 @@
+import streamlit as st
 import yfinance as yf
 import pandas as pd
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import logging
 
@@ -8,19 +10,47 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@st.cache_data(ttl=900, show_spinner=False)
+def _fetch_stock_data(symbol, start_date, end_date):
+    """
+    Fetch history and info for a symbol, cached per (symbol, date range)
+    """
+    stock = yf.Ticker(symbol)
+    # History and info are separate Yahoo requests; overlap their latency
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        hist_future = pool.submit(stock.history, start=start_date, end=end_date)
+        info_future = pool.submit(stock.get_info)
+        hist_data = hist_future.result()
+        if hist_data.empty:
+            raise ValueError(f"No price history for {symbol} between {start_date} and {end_date}")
+        return hist_data, info_future.result()
+
+
 def get_stock_data(symbol, start_date, end_date):
     """
     Fetch stock data from Yahoo Finance
+
+    Returns (None, None) when the fetch fails or finds no price history.
+    Failed fetches raise out of the cached helper, so they are not cached.
     """
     try:
-        stock = yf.Ticker(symbol)
-        hist = stock.history(start=start_date, end=end_date)
-        return hist, stock.info
+        return _fetch_stock_data(symbol, start_date, end_date)
     except Exception as e:
         logger.error(f"Error fetching stock data: {str(e)}")
         return None, None
 
 
+def get_stock_data_batch(symbols, start_date, end_date):
+    """
+    Fetch stock data for several symbols from Yahoo Finance
+
+    Returns a dict of symbol -> (history, info); symbols that failed or have
+    no price history map to (None, None).
+    """
+    return {sym: get_stock_data(sym, start_date, end_date) for sym in symbols}
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_fundamental_metrics(stock_info):
     """
     Extract and format comprehensive financial metrics for fundamental analysis
@@ -83,13 +113,31 @@ def get_fundamental_metrics(stock_info):
                 'Value': formatted_value
             })
 
-    return pd.DataFrame(formatted_metrics)
+    # Arrow-backed strings let st.dataframe serialize without a pandas->Arrow copy
+    # Present-but-None info values would otherwise become <NA>
+    return pd.DataFrame(formatted_metrics).astype('string[pyarrow]').fillna('N/A')
+
+def downsample_ohlc(df, max_points=1000):
+    """
+    Aggregate OHLC bars into wider time buckets so at most ~max_points candles are plotted
+    """
+    if len(df) <= max_points:
+        return df
+
+    span_days = (df.index[-1] - df.index[0]).days
+    bucket_days = max(1, -(-span_days // max_points))
+    agg = {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+    if 'Volume' in df.columns:
+        agg['Volume'] = 'sum'
+    return df.resample(f"{bucket_days}D").agg(agg).dropna(subset=['Close'])
 
 def format_data_for_download(hist_data):
     """
     Format historical data for CSV download
     """
-    df = hist_data.copy()
-    df.index = df.index.strftime('%Y-%m-%d')
-    df = df.round(2)
+    # round() already returns a new frame, so no separate copy is needed
+    df = hist_data.round(2)
+    # Day-truncating the local wall-clock datetime64 values yields ISO dates without per-row strftime
+    dates = df.index.tz_localize(None).to_numpy().astype('datetime64[D]').astype(str)
+    df.index = pd.Index(dates, name=df.index.name)
     return df
\ No newline at end of file